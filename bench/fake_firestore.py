@@ -0,0 +1,162 @@
+from copy import deepcopy
+from datetime import datetime, timezone
+import itertools
+
+from firebase_admin import firestore
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1.field_path import FieldPath
+
+# =========================
+# FIRESTORE EM MEMÓRIA
+# =========================
+
+# Implementa só o subconjunto da API usado por functions/: collection,
+# document, get/set/update/delete, where(filter=FieldFilter), stream,
+# get_all e batch. Cada leitura devolve uma cópia, como a desserialização
+# do cliente real.
+
+_OPS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+}
+
+_auto_ids = itertools.count(1)
+
+def _resolve(value, current):
+    if value is firestore.SERVER_TIMESTAMP:
+        return datetime.now(timezone.utc)
+    if isinstance(value, firestore.Increment):
+        return (current or 0) + value.value
+    if isinstance(value, dict):
+        base = current if isinstance(current, dict) else {}
+        merged = dict(base)
+        for key, item in value.items():
+            merged[key] = _resolve(item, base.get(key))
+        return merged
+    return value
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return (self._data or {}).get(field)
+
+class FakeDocument:
+    def __init__(self, client, collection, doc_id):
+        self._client = client
+        self._collection = collection
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    @property
+    def _store(self):
+        return self._client._data.setdefault(self._collection, {})
+
+    def get(self):
+        self._client.reads += 1
+        return FakeSnapshot(self, self._store.get(self.id))
+
+    def set(self, data, merge=False):
+        self._client.writes += 1
+        current = self._store.get(self.id) if merge else None
+        self._store[self.id] = _resolve(deepcopy(data), current)
+
+    def update(self, data):
+        if self.id not in self._store:
+            raise NotFound(f"No document to update: {self.path}")
+
+        self._client.writes += 1
+        doc = self._store[self.id]
+        for key, value in data.items():
+            *parents, leaf = FieldPath.from_api_repr(key).parts
+            node = doc
+            for part in parents:
+                node = node.setdefault(part, {})
+            node[leaf] = _resolve(value, node.get(leaf))
+
+    def delete(self):
+        self._client.writes += 1
+        self._store.pop(self.id, None)
+
+class FakeQuery:
+    def __init__(self, client, collection, filters=()):
+        self._client = client
+        self._collection = collection
+        self._filters = tuple(filters)
+
+    def where(self, *args, filter=None):
+        if filter is None:
+            filter = firestore.FieldFilter(*args)
+        return FakeQuery(self._client, self._collection, self._filters + (filter,))
+
+    def stream(self):
+        store = self._client._data.get(self._collection, {})
+        for doc_id, data in list(store.items()):
+            if all(_OPS[f.op_string](data.get(f.field_path), f.value) for f in self._filters):
+                self._client.reads += 1
+                yield FakeSnapshot(FakeDocument(self._client, self._collection, doc_id), data)
+
+    def get(self):
+        return list(self.stream())
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client, name):
+        super().__init__(client, name)
+        self.id = name
+
+    def document(self, doc_id=None):
+        return FakeDocument(self._client, self._collection, doc_id or f"auto{next(_auto_ids)}")
+
+class FakeBatch:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def set(self, reference, data, merge=False):
+        self._ops.append(lambda: reference.set(data, merge=merge))
+
+    def update(self, reference, data):
+        self._ops.append(lambda: reference.update(data))
+
+    def delete(self, reference):
+        self._ops.append(reference.delete)
+
+    def commit(self):
+        self._client.commits += 1
+        for op in self._ops:
+            op()
+        self._ops = []
+
+class FakeClient:
+    def __init__(self):
+        self._data = {}
+        self.reads = 0
+        self.writes = 0
+        self.commits = 0
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, references, field_paths=None, transaction=None):
+        for reference in references:
+            yield reference.get()
+
+    def seed(self, collection, docs):
+        store = self._data.setdefault(collection, {})
+        for doc_id, data in docs:
+            store[doc_id] = deepcopy(data)
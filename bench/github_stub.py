@@ -0,0 +1,189 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import json
+import random
+import re
+from threading import Lock, Thread
+import time
+from urllib.parse import parse_qs, urlencode, urlparse
+
+# =========================
+# STUB DA API DO GITHUB
+# =========================
+
+# Serve um subconjunto da API REST do GitHub com dados sintéticos:
+# /users/{u}/repos, /repos/{o}/{r}/languages e /commits, /pulls, /issues.
+# Suporta paginação via Link, ETag/If-None-Match, cabeçalhos de rate limit
+# (403 com a cota esgotada, como a API real), respostas 403/429 enfileiradas
+# com throttle() e latência artificial por requisição.
+
+LANGUAGES = ("Python", "JavaScript", "TypeScript", "HTML", "CSS", "Go", "Shell", "C++")
+
+class GitHubStub:
+    def __init__(self, username: str = "stub-user", repos: int = 50, latency: float = 0.0,
+                 rate_limit: int = 5000, reset_in: int = 3600, seed: int = 0):
+        rng = random.Random(seed)
+        self.username = username
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_in = reset_in
+        self.reset_at = int(time.time()) + reset_in
+        self.hits = 0
+        self.not_modified = 0
+        # Requisições que chegaram com a cota já esgotada.
+        self.overdrawn = 0
+        self.throttled = []
+        # full_name -> status devolvido por /repos/{full_name}/... (ex.: 404, 451).
+        self.failures = {}
+        self._lock = Lock()
+
+        self.repos = []
+        for i in range(repos):
+            langs = rng.sample(LANGUAGES, rng.randint(0, 3))
+            self.repos.append({
+                "name": f"repo-{i:04d}",
+                "full_name": f"{username}/repo-{i:04d}",
+                "owner": {"login": username},
+                "fork": False,
+                "stargazers_count": rng.randint(0, 50),
+                "forks_count": rng.randint(0, 10),
+                "language": langs[0] if langs else None,
+                "pushed_at": f"2026-01-{1 + i % 28:02d}T00:00:00Z",
+                "_languages": {lang: rng.randint(1_000, 500_000) for lang in langs},
+                "_commits": rng.randint(0, 300),
+                "_pulls": rng.randint(0, 20),
+                "_issues": rng.randint(0, 30),
+            })
+
+    def public(self, repo: dict) -> dict:
+        return {k: v for k, v in repo.items() if not k.startswith("_")}
+
+    def touch(self, index: int, **changes) -> None:
+        self.repos[index].update(changes)
+
+    def fail(self, index: int, status: int) -> None:
+        self.failures[self.repos[index]["full_name"]] = status
+
+    # Próxima resposta: 429 com Retry-After, ou 403 com a cota zerada.
+    def throttle(self, status: int, retry_after: int | None = None) -> None:
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        with self._lock:
+            self.throttled.append((status, headers))
+
+    def reset_quota(self) -> None:
+        with self._lock:
+            self.remaining = self.rate_limit
+            self.reset_at += self.reset_in
+
+    def resolve(self, path: str, query: dict):
+        match = re.fullmatch(r"/users/([^/]+)/repos", path)
+        if match:
+            # Como a API real: usuário inexistente é 404.
+            if match.group(1) != self.username:
+                return None
+            return [self.public(r) for r in self.repos if r["owner"]["login"] == match.group(1)]
+
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)/(languages|commits|pulls|issues)", path)
+        if not match:
+            return None
+
+        repo = next((r for r in self.repos if r["full_name"] == f"{match.group(1)}/{match.group(2)}"), None)
+        if repo is None:
+            return None
+
+        kind = match.group(3)
+        if kind == "languages":
+            return repo["_languages"]
+        total = repo["_issues"] + repo["_pulls"] if kind == "issues" else repo[f"_{kind}"]
+        return [{"id": n} for n in range(total)]
+
+    def start(self, host: str = "127.0.0.1", port: int = 0):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, para exercitar o pool de conexões do cliente.
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                with stub._lock:
+                    throttled = stub.throttled.pop(0) if stub.throttled else None
+                    if throttled is None and stub.remaining == 0:
+                        stub.overdrawn += 1
+                        throttled = (403, {})
+                if throttled is not None:
+                    status, headers = throttled
+                    self.send_response(status)
+                    self.send_header("X-RateLimit-Limit", str(stub.rate_limit))
+                    self.send_header("X-RateLimit-Remaining", str(stub.remaining if "Retry-After" in headers else 0))
+                    self.send_header("X-RateLimit-Reset", str(stub.reset_at))
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                match = re.match(r"/repos/([^/]+/[^/]+)/", parsed.path)
+                status = stub.failures.get(match.group(1)) if match else None
+                data = stub.resolve(parsed.path, query) if status is None else None
+                if data is None:
+                    self.send_response(status or 404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                headers = {}
+                if isinstance(data, list):
+                    per_page = int(query.get("per_page", 30))
+                    page = int(query.get("page", 1))
+                    last = max(1, -(-len(data) // per_page))
+                    data = data[(page - 1) * per_page:page * per_page]
+
+                    base = f"http://{self.headers['Host']}{parsed.path}"
+                    links = []
+                    if page < last:
+                        links.append(f'<{base}?{urlencode({**query, "page": page + 1})}>; rel="next"')
+                        links.append(f'<{base}?{urlencode({**query, "page": last})}>; rel="last"')
+                    if links:
+                        headers["Link"] = ", ".join(links)
+
+                body = json.dumps(data).encode("utf-8")
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+
+                with stub._lock:
+                    stub.hits += 1
+                    fresh = self.headers.get("If-None-Match") != etag
+                    if fresh:
+                        stub.remaining = max(0, stub.remaining - 1)
+                    else:
+                        stub.not_modified += 1
+                    remaining = stub.remaining
+
+                self.send_response(200 if fresh else 304)
+                self.send_header("ETag", etag)
+                self.send_header("X-RateLimit-Limit", str(stub.rate_limit))
+                self.send_header("X-RateLimit-Remaining", str(remaining))
+                self.send_header("X-RateLimit-Reset", str(stub.reset_at))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+
+                if fresh:
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self.end_headers()
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://{host}:{server.server_port}"
@@ -0,0 +1,166 @@
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+FUNCTIONS = ROOT / "functions"
+
+# =========================
+# CONFIGURAÇÃO
+# =========================
+
+# Módulos do próprio projeto, cujo custo de import é responsabilidade nossa.
+OWN_MODULES = ("main", "cache", "compression", "summary", "template", "timing")
+
+# Devem ficar fora do import de main.py (carregados só na primeira requisição).
+# O SDK do Firestore (google.cloud.firestore_v1, ~330 ms) também é puxado
+# indiretamente, por exemplo por firebase_functions.firestore_fn.
+DEFERRED_MODULES = ("firebase_admin.firestore", "google.cloud.firestore", "google.cloud.firestore_v1")
+
+# Orçamento padrão do import completo de main.py; o piso é o do
+# firebase_functions.https_fn (Flask + SDK), ~400 ms.
+MAX_IMPORT_MS = 550.0
+
+# Importa main.py do zero e mede a primeira e a segunda requisição contra o
+# Firestore em memória do benchmark.
+COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+sys.path.insert(0, {bench!r})
+from unittest import mock
+from statssvg import make_request, seeded_client
+
+db = seeded_client(100)
+with mock.patch.object(main, "get_db", return_value=db):
+    t0 = time.perf_counter()
+    main.statsSvg(make_request())
+    t1 = time.perf_counter()
+    main.statsSvg(make_request())
+    t2 = time.perf_counter()
+
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (t1 - t0) * 1000,
+    "second_request_ms": (t2 - t1) * 1000,
+}}))
+"""
+
+# =========================
+# MEDIÇÃO
+# =========================
+
+def parse_importtime(stderr: str) -> dict:
+    modules = {}
+    pending = []
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        modules[name] = {"self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000, "depth": depth}
+
+        # -X importtime lista os filhos antes do pai.
+        if depth == 1:
+            pending.append(name)
+        elif depth == 0:
+            modules[name]["children"] = pending
+            pending = []
+
+    return modules
+
+def run_importtime() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=FUNCTIONS, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+def run_cold_start() -> dict:
+    script = COLD_START_SCRIPT.format(bench=str(ROOT / "bench"))
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=FUNCTIONS, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def median_of(runs: list, key) -> float:
+    return statistics.median(key(run) for run in runs)
+
+def report(runs: int, top: int) -> dict:
+    imports = [run_importtime() for _ in range(runs)]
+    cold = [run_cold_start() for _ in range(runs)]
+    last = imports[-1]
+
+    direct = last["main"]["children"]
+    heaviest = sorted(direct, key=lambda name: -median_of(imports, lambda m: m.get(name, {}).get("cumulative_ms", 0)))
+
+    return {
+        "main_cumulative_ms": median_of(imports, lambda m: m["main"]["cumulative_ms"]),
+        "own_self_ms": {
+            name: median_of(imports, lambda m: m.get(name, {}).get("self_ms", 0))
+            for name in OWN_MODULES
+        },
+        "heaviest_imports_ms": {
+            name: median_of(imports, lambda m: m.get(name, {}).get("cumulative_ms", 0))
+            for name in heaviest[:top]
+        },
+        "deferred_loaded": [name for name in DEFERRED_MODULES if name in last],
+        "import_ms": median_of(cold, lambda c: c["import_ms"]),
+        "first_request_ms": median_of(cold, lambda c: c["first_request_ms"]),
+        "second_request_ms": median_of(cold, lambda c: c["second_request_ms"]),
+    }
+
+# =========================
+# CLI
+# =========================
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Relatório de tempo de import e cold start de functions/main.py.")
+    parser.add_argument("--runs", type=int, default=5, help="processos medidos (mediana)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=MAX_IMPORT_MS,
+                        help="orçamento para o import completo de main")
+    parser.add_argument("--max-own-ms", type=float, default=50.0,
+                        help="orçamento para o tempo próprio dos módulos do projeto")
+    parser.add_argument("--json", type=Path, help="grava o relatório neste arquivo")
+    args = parser.parse_args(argv)
+
+    result = report(args.runs, args.top)
+
+    print(f"import main (cumulativo): {result['main_cumulative_ms']:.1f} ms")
+    print(f"cold start: import {result['import_ms']:.1f} ms · 1ª requisição {result['first_request_ms']:.2f} ms"
+          f" · 2ª requisição {result['second_request_ms']:.2f} ms")
+    print("módulos do projeto (tempo próprio):")
+    for name, ms in result["own_self_ms"].items():
+        print(f"  {name:<14} {ms:8.2f} ms")
+    print("imports diretos mais pesados (cumulativo):")
+    for name, ms in result["heaviest_imports_ms"].items():
+        print(f"  {name:<40} {ms:8.1f} ms")
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+
+    failures = []
+    if result["deferred_loaded"]:
+        failures.append(f"importados no startup, deveriam ser adiados: {', '.join(result['deferred_loaded'])}")
+    own = sum(result["own_self_ms"].values())
+    if own > args.max_own_ms:
+        failures.append(f"módulos do projeto: {own:.1f} ms > orçamento {args.max_own_ms:.1f} ms")
+    if result["main_cumulative_ms"] > args.max_import_ms:
+        failures.append(f"import main: {result['main_cumulative_ms']:.1f} ms > orçamento {args.max_import_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"FALHA: {failure}", file=sys.stderr)
+    print("FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
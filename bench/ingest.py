@@ -0,0 +1,133 @@
+import argparse
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "functions"))
+
+from fake_firestore import FakeClient
+from github_stub import GitHubStub
+from ingest import GitHubClient, RateLimiter, ingest_user
+from summary import REPOS_COLLECTION, SUMMARY_COLLECTION, summarize_repos
+
+# =========================
+# BENCHMARK DA INGESTÃO
+# =========================
+
+def run(client_factory, db, username: str) -> tuple:
+    client = client_factory()
+    start = time.perf_counter()
+    result = ingest_user(client, db, username)
+    return time.perf_counter() - start, result
+
+# Cota pequena, um 429 com Retry-After e um 403 com a cota zerada logo na
+# primeira requisição. sleep e clock injetados: nada dorme de verdade, e o
+# "sleep" renova a cota do stub como o reset real faria.
+def run_rate_limited(workers: int, repos: int, min_remaining: int = 10) -> list:
+    stub = GitHubStub(repos=repos, rate_limit=4 * min_remaining, reset_in=60)
+    server, base_url = stub.start()
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if seconds > 30:
+            stub.reset_quota()
+
+    limiter = RateLimiter(min_remaining=min_remaining, sleep=sleep, clock=lambda: stub.reset_at - 60)
+    client = GitHubClient(base_url=base_url, workers=workers, limiter=limiter)
+    stub.throttle(429, retry_after=7)
+    stub.throttle(403)
+
+    try:
+        result = ingest_user(client, FakeClient(), stub.username)
+    finally:
+        server.shutdown()
+
+    print(f"workers={workers}: rate limit {result['rate_limit_waits']} esperas {sorted(set(sleeps))}")
+
+    failures = []
+    if sleeps[:2] != [7.0, 61.0]:
+        failures.append(f"workers={workers}: 429/Retry-After e 403/reset deveriam esperar 7s e 61s, foi {sleeps[:2]}")
+    if 1.0 in sleeps:
+        failures.append(f"workers={workers}: espera redundante depois do reset")
+    if sleeps.count(61.0) < 2:
+        failures.append(f"workers={workers}: cota baixa deveria pausar até o reset antes de esgotar")
+    if result["rate_limit_waits"] != len(sleeps):
+        failures.append(f"workers={workers}: rate_limit_waits={result['rate_limit_waits']}, {len(sleeps)} esperas")
+    if stub.overdrawn or result["failed"] or result["repos"] != repos:
+        failures.append(f"workers={workers}: ingestão com rate limit esgotou a cota ou perdeu repositórios")
+    return failures
+
+# Increment deixa linguagens zeradas no mapa; a leitura as descarta.
+def nonzero(value):
+    if isinstance(value, dict):
+        return {k: n for k, n in value.items() if n}
+    return value
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingestão contra um stub local da API do GitHub.")
+    parser.add_argument("--repos", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="latência artificial por requisição")
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    for workers in args.workers:
+        stub = GitHubStub(repos=args.repos, latency=args.latency_ms / 1000)
+        server, base_url = stub.start()
+        db = FakeClient()
+        cache = {}
+
+        def factory():
+            return GitHubClient(base_url=base_url, workers=workers, cache=cache, limiter=RateLimiter(min_remaining=0))
+
+        try:
+            cold, first = run(factory, db, stub.username)
+            stub.touch(0, stargazers_count=999)
+            stub.touch(1, pushed_at="2026-02-01T00:00:00Z", _languages={"Rust": 4242})
+            warm, second = run(factory, db, stub.username)
+            # Repositório que passa a falhar: os demais seguem e o documento fica.
+            kept = dict(db._data[REPOS_COLLECTION][f"{stub.username}__repo-0002"])
+            stub.fail(2, 451)
+            stub.touch(2, pushed_at="2026-03-01T00:00:00Z")
+            _, third = run(factory, db, stub.username)
+        finally:
+            server.shutdown()
+
+        stored = db._data.get(REPOS_COLLECTION, {})
+        print(f"workers={workers}: fria {cold:.2f}s {first}")
+        print(f"workers={workers}: condicional {warm:.2f}s {second}")
+
+        if len(stored) != args.repos:
+            failures.append(f"workers={workers}: {len(stored)} documentos, esperado {args.repos}")
+        if second["not_modified"] < second["requests"] - 2:
+            failures.append(f"workers={workers}: segunda rodada deveria responder quase tudo com 304")
+        if stored[f"{stub.username}__repo-0000"]["stars"] != 999:
+            failures.append(f"workers={workers}: alteração do repo-0000 não foi gravada")
+        if stored[f"{stub.username}__repo-0001"]["languages"] != {"Rust": 4242}:
+            failures.append(f"workers={workers}: push no repo-0001 não renovou as linguagens")
+        if second["languages_reused"] != args.repos - 1:
+            failures.append(f"workers={workers}: só o repo-0001 deveria ter /languages buscado de novo")
+        # A primeira rodada recalcula o resumo; a segunda aplica só deltas.
+        summary = db._data.get(SUMMARY_COLLECTION, {}).get(stub.username)
+        expected = summarize_repos(list(stored.values()))
+        if third["failed"] != [f"{stub.username}/repo-0002"]:
+            failures.append(f"workers={workers}: falha no repo-0002 deveria ser reportada sem abortar")
+        if stored[f"{stub.username}__repo-0002"] != kept or len(stored) != args.repos:
+            failures.append(f"workers={workers}: documento do repo com falha deveria ser mantido")
+        if second["summary"] != "delta":
+            failures.append(f"workers={workers}: segunda rodada deveria aplicar deltas ao resumo")
+        if summary is None or any(nonzero(summary[k]) != v for k, v in expected.items()):
+            failures.append(f"workers={workers}: resumo não corresponde aos repositórios gravados")
+
+        failures += run_rate_limited(workers, args.repos // 4)
+
+    for failure in failures:
+        print(f"FALHA: {failure}", file=sys.stderr)
+    print("FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,290 @@
+import argparse
+from collections import Counter
+import json
+import os
+from pathlib import Path
+import random
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "functions"))
+
+# O log JSON por requisição de main.py poluiria a saída do relatório.
+os.environ.setdefault("REQUEST_LOGS", "0")
+
+from firebase_admin import firestore
+from flask import Request
+from werkzeug.test import EnvironBuilder
+
+import main
+from fake_firestore import FakeClient
+from template import minify_svg
+from summary import REPOS_COLLECTION, SUMMARY_COLLECTION, load_summary, summarize_repos, summary_version
+
+# =========================
+# CONFIGURAÇÃO
+# =========================
+
+USERNAME = "bench-user"
+THEME = "tokyonight"
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000)
+SCENARIOS = ("rebuild", "summary", "cached", "not_modified")
+
+# Orçamentos padrão de p95 (ms), com folga de ~3-10x sobre as medições de
+# referência. Os cenários com resumo não podem depender do número de
+# repositórios; a reconstrução é linear: fixo + custo por repositório.
+# --max-p95 CENÁRIO=MS substitui o padrão do cenário.
+MAX_P95_MS = {"summary": 2.0, "cached": 2.0, "not_modified": 2.0}
+REBUILD_P95_MS = (5.0, 0.05)
+
+# Linguagens com pesos aproximados de um perfil real.
+LANGUAGES = {
+    "Python": 30, "JavaScript": 20, "TypeScript": 12, "HTML": 8, "CSS": 6,
+    "Jupyter Notebook": 5, "Go": 4, "Shell": 4, "C": 3, "C++": 3,
+    "Java": 2, "Rust": 1, "Vue": 1, None: 6,
+}
+
+# =========================
+# DADOS SINTÉTICOS
+# =========================
+
+def synthetic_repos(size: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    langs = list(LANGUAGES)
+    weights = list(LANGUAGES.values())
+    repos = []
+
+    for i in range(size):
+        # ~10% dos documentos pertencem a outro dono, para exercitar o filtro.
+        owner = USERNAME if i % 10 else "other-user"
+        language = rng.choices(langs, weights)[0]
+        repos.append((f"{owner}-repo-{i}", {
+            "owner": owner,
+            "name": f"repo-{i}",
+            "stars": int(rng.paretovariate(1.5)) - 1,
+            "forks": int(rng.paretovariate(2.5)) - 1,
+            "language": language,
+            "languages": {language: rng.randint(1_000, 2_000_000)} if language else {},
+        }))
+
+    return repos
+
+def seeded_client(size: int, seed: int = 0) -> FakeClient:
+    db = FakeClient()
+    db.seed(REPOS_COLLECTION, synthetic_repos(size, seed))
+    return db
+
+def make_request(etag: str | None = None) -> Request:
+    headers = {"If-None-Match": etag} if etag else {}
+    builder = EnvironBuilder(path="/statsSvg", query_string={"username": USERNAME, "theme": THEME}, headers=headers)
+    return Request(builder.get_environ())
+
+# =========================
+# MEDIÇÃO
+# =========================
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+def summarize_timings(samples: list) -> dict:
+    total = sum(samples)
+    return {
+        "n": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "rps": len(samples) / total if total else float("inf"),
+    }
+
+def time_call(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 0.50) * 1000
+
+def prepare(db: FakeClient, scenario: str, etag: str) -> Request:
+    if scenario == "rebuild":
+        db.collection(SUMMARY_COLLECTION).document(USERNAME).delete()
+    if scenario in ("rebuild", "summary"):
+        main.svg_cache.clear()
+    return make_request(etag if scenario == "not_modified" else None)
+
+def run_scenario(db: FakeClient, scenario: str, iterations: int, etag: str) -> dict:
+    expected = 304 if scenario == "not_modified" else 200
+    samples = []
+
+    for _ in range(iterations):
+        req = prepare(db, scenario, etag)
+        start = time.perf_counter()
+        response = main.statsSvg(req)
+        samples.append(time.perf_counter() - start)
+
+        if response.status_code != expected:
+            raise RuntimeError(f"{scenario}: status {response.status_code}, esperado {expected}")
+
+    result = summarize_timings(samples)
+
+    req = prepare(db, scenario, etag)
+    tracemalloc.start()
+    main.statsSvg(req)
+    result["peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    return result
+
+def run_stages(db: FakeClient, repeat: int) -> dict:
+    query = db.collection(REPOS_COLLECTION).where(filter=firestore.FieldFilter("owner", "==", USERNAME))
+    repos = [doc.to_dict() for doc in query.stream()]
+    summary = load_summary(db, USERNAME)
+    user = {"name": USERNAME, "login": USERNAME}
+    langs = Counter(summary["langs"])
+    body = main.dashboard_template.render(THEME, user, summary["repos"], summary["stars"], summary["forks"], langs)
+
+    return {
+        "stream_ms": time_call(lambda: [doc.to_dict() for doc in query.stream()], repeat),
+        "aggregate_ms": time_call(lambda: summarize_repos(repos), repeat),
+        "summary_read_ms": time_call(lambda: load_summary(db, USERNAME), repeat),
+        "render_ms": time_call(
+            lambda: main.dashboard_template.render(
+                THEME, user, summary["repos"], summary["stars"], summary["forks"], langs
+            ),
+            repeat,
+        ),
+        "etag_ms": time_call(lambda: main.make_version_etag(USERNAME, THEME, summary_version(summary)), repeat),
+        "etag_body_ms": time_call(lambda: main.make_etag(body.decode("utf-8")), repeat),
+    }
+
+def verify(db: FakeClient) -> None:
+    # Primeiro a partir da reconstrução, depois do resumo já gravado.
+    db.collection(SUMMARY_COLLECTION).document(USERNAME).delete()
+    bodies = []
+    for _ in range(2):
+        main.svg_cache.clear()
+        bodies.append(main.statsSvg(make_request()).get_data())
+
+    # Ordem de inserção invertida: empates não podem depender dela.
+    repos = [data for _, data in db._data[REPOS_COLLECTION].items() if data["owner"] == USERNAME][::-1]
+    langs = Counter(r["language"] for r in repos if r.get("language"))
+    user = {"name": USERNAME, "login": USERNAME}
+    reference = minify_svg(main.build_combined_svg(user, repos, langs, main.THEMES[THEME])).encode("utf-8")
+
+    for body in bodies:
+        if body != reference:
+            raise RuntimeError("statsSvg divergiu de build_combined_svg")
+
+    # Empates explícitos, em duas ordens de inserção, em todos os temas.
+    tied = [("Go", 3), ("Rust", 3), ("C", 3), ("Python", 5), ("Shell", 1), ("Vue", 1), ("Java", 3)]
+    for theme_name, theme in main.THEMES.items():
+        expected = minify_svg(main.build_dashboard_svg(user, 7, 1, 2, Counter(dict(tied)), theme)).encode("utf-8")
+        for order in (tied, tied[::-1]):
+            if main.dashboard_template.render(theme_name, user, 7, 1, 2, Counter(dict(order))) != expected:
+                raise RuntimeError(f"template divergiu de build_dashboard_svg em empates ({theme_name})")
+
+def benchmark(sizes: list, requests: int, scan_budget: int, stage_repeat: int) -> dict:
+    results = {}
+
+    for size in sizes:
+        db = seeded_client(size)
+
+        with mock.patch.object(main, "get_db", return_value=db):
+            verify(db)
+            entry = {}
+            for scenario in SCENARIOS:
+                # Aquece o cache e captura a ETag da versão atual do resumo.
+                etag = main.statsSvg(make_request()).headers["ETag"]
+                iterations = requests
+                if scenario == "rebuild":
+                    iterations = max(3, min(requests, scan_budget // size))
+                entry[scenario] = run_scenario(db, scenario, iterations, etag)
+            entry["stages"] = run_stages(db, max(3, min(stage_repeat, scan_budget // size)))
+
+        results[str(size)] = entry
+
+    return results
+
+# =========================
+# REGRESSÃO
+# =========================
+
+def default_budget(scenario: str, size: int) -> float:
+    if scenario == "rebuild":
+        fixed, per_repo = REBUILD_P95_MS
+        return fixed + per_repo * size
+    return MAX_P95_MS[scenario]
+
+def check_regressions(results: dict, baseline: dict | None, tolerance: float, noise_ms: float, budgets: dict) -> list:
+    failures = []
+
+    for size, entry in results.items():
+        for scenario in SCENARIOS:
+            p95 = entry[scenario]["p95_ms"]
+
+            budget = budgets.get(scenario, default_budget(scenario, int(size)))
+            if p95 > budget:
+                failures.append(f"{scenario}@{size}: p95 {p95:.2f}ms > orçamento {budget:.2f}ms")
+
+            old = ((baseline or {}).get(size) or {}).get(scenario)
+            if old is None:
+                continue
+            limit = old["p95_ms"] * (1 + tolerance)
+            if p95 > limit and p95 - old["p95_ms"] > noise_ms:
+                failures.append(f"{scenario}@{size}: p95 {p95:.2f}ms > baseline {old['p95_ms']:.2f}ms (+{tolerance:.0%})")
+
+    return failures
+
+def print_report(results: dict) -> None:
+    print(f"{'repos':>8} {'cenário':<13} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>10} {'pico KB':>9}")
+    for size, entry in results.items():
+        for scenario in SCENARIOS:
+            r = entry[scenario]
+            print(
+                f"{size:>8} {scenario:<13} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} "
+                f"{r['p99_ms']:>9.3f} {r['rps']:>10.1f} {r['peak_kb']:>9.1f}"
+            )
+        stages = "  ".join(f"{k[:-3]}={v:.3f}" for k, v in entry["stages"].items())
+        print(f"{'':>8} estágios (ms): {stages}")
+
+def parse_budget(value: str) -> tuple:
+    scenario, _, ms = value.partition("=")
+    if scenario not in SCENARIOS or not ms:
+        raise argparse.ArgumentTypeError(f"use CENÁRIO=MS com CENÁRIO em {', '.join(SCENARIOS)}")
+    return scenario, float(ms)
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline do statsSvg com Firestore em memória.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--requests", type=int, default=200, help="requisições por cenário")
+    parser.add_argument("--scan-budget", type=int, default=1_000_000,
+                        help="limita requisições de cenários com varredura completa a ~N documentos lidos")
+    parser.add_argument("--stage-repeat", type=int, default=50)
+    parser.add_argument("--json", type=Path, help="grava os resultados neste arquivo")
+    parser.add_argument("--baseline", type=Path, help="resultados anteriores para comparação de p95")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="regressão relativa aceita sobre o baseline")
+    parser.add_argument("--noise-ms", type=float, default=0.5, help="diferença absoluta ignorada como ruído")
+    parser.add_argument("--max-p95", type=parse_budget, action="append", default=[],
+                        metavar="CENÁRIO=MS",
+                        help="orçamento absoluto de p95 por cenário (padrão: MAX_P95_MS/REBUILD_P95_MS)")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.sizes, args.requests, args.scan_budget, args.stage_repeat)
+    print_report(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    failures = check_regressions(results, baseline, args.tolerance, args.noise_ms, dict(args.max_p95))
+
+    for failure in failures:
+        print(f"FALHA: {failure}", file=sys.stderr)
+    print("FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,29 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# =========================
+# CODIFICAÇÕES
+# =========================
+
+# Ordem de preferência do servidor quando o cliente aceita várias.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+GZIP_LEVEL = 9
+# Respostas são comprimidas uma vez por entrada de cache; 5 é rápido e
+# fica a poucos bytes da qualidade máxima em SVGs deste tamanho.
+BROTLI_QUALITY = 5
+
+def compress(body: bytes, encoding: str, quality: int | None = None) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 deixa a saída determinística (mesmos bytes, mesmo hash).
+        return gzip.compress(body, compresslevel=GZIP_LEVEL if quality is None else quality, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY if quality is None else quality)
+    raise ValueError(f"codificação não suportada: {encoding}")
+
+def negotiate(accept_encodings) -> str:
+    return accept_encodings.best_match(ENCODINGS) or "identity"
@@ -0,0 +1,403 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+import time
+from urllib.parse import parse_qs, urlparse
+
+from firebase_admin import firestore, initialize_app
+import requests
+from requests.adapters import HTTPAdapter
+
+from summary import (
+    REPOS_COLLECTION,
+    delta_update,
+    is_stale,
+    summary_delta,
+    summary_ref,
+    user_key,
+    write_summary,
+)
+from timing import collect, stage
+
+# =========================
+# CONFIGURAÇÃO
+# =========================
+
+API_URL = "https://api.github.com"
+PER_PAGE = 100
+# Limite do Firestore é 500 operações por batch.
+BATCH_SIZE = 400
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# RATE LIMIT
+# =========================
+
+class RateLimitExceeded(RuntimeError):
+    pass
+
+class RateLimiter:
+    def __init__(self, min_remaining: int = 50, max_wait: float = 900.0, sleep=time.sleep, clock=time.time):
+        self.min_remaining = min_remaining
+        self.max_wait = max_wait
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = Lock()
+        self.remaining = None
+        self.reset_at = None
+        self.waited_reset = None
+        self.waits = 0
+
+    def observe(self, headers) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_at = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset_at is None:
+            return
+
+        with self._lock:
+            # Respostas em voo de uma janela que já esperamos passar não rearmam a espera.
+            if self.waited_reset is not None and float(reset_at) <= self.waited_reset:
+                return
+            self.remaining = int(remaining)
+            self.reset_at = float(reset_at)
+
+    def backoff(self, seconds: float) -> None:
+        if seconds > self.max_wait:
+            raise RateLimitExceeded(f"rate limit da API do GitHub: espera de {seconds:.0f}s excede o máximo")
+
+        with self._lock:
+            self.waits += 1
+        self._sleep(seconds)
+
+    def wait(self) -> None:
+        with self._lock:
+            if self.remaining is None or self.remaining > self.min_remaining:
+                return
+            reset_at = self.reset_at
+
+        self.wait_until(reset_at)
+
+    def wait_until(self, reset_at: float) -> None:
+        with self._lock:
+            # Depois da espera a cota é renovada; evita que todas as threads durmam de novo.
+            self.remaining = None
+            self.waited_reset = max(reset_at, self.waited_reset or reset_at)
+        self.backoff(max(0.0, reset_at - self._clock()) + 1)
+
+# =========================
+# CLIENTE HTTP
+# =========================
+
+class GitHubClient:
+    def __init__(self, token: str | None = None, base_url: str = API_URL, workers: int = 8,
+                 cache: dict | None = None, limiter: RateLimiter | None = None, max_retries: int = 3):
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.cache = cache if cache is not None else {}
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        self._lock = Lock()
+        self.requests = 0
+        self.not_modified = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept"] = "application/vnd.github+json"
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _url(self, path: str, params: dict | None = None) -> str:
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        return requests.Request("GET", url, params=params).prepare().url
+
+    def get(self, path: str, params: dict | None = None) -> tuple:
+        url = self._url(path, params)
+
+        with self._lock:
+            cached = self.cache.get(url)
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait()
+            response = self.session.get(url, headers=headers, timeout=30)
+            self.limiter.observe(response.headers)
+
+            with self._lock:
+                self.requests += 1
+
+            if response.status_code in (403, 429) and attempt < self.max_retries:
+                retry_after = response.headers.get("Retry-After")
+                if retry_after is not None:
+                    self.limiter.backoff(float(retry_after))
+                    continue
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    self.limiter.wait_until(float(response.headers["X-RateLimit-Reset"]))
+                    continue
+            break
+
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.not_modified += 1
+            return cached["data"], cached["links"], True
+
+        if response.status_code == 409:
+            # Repositório vazio (ex.: /commits sem nenhum commit).
+            return [], {}, False
+
+        response.raise_for_status()
+
+        data = response.json()
+        links = {rel: link["url"] for rel, link in response.links.items()}
+        entry = {"data": data, "links": links}
+        if response.headers.get("ETag"):
+            entry["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            entry["last_modified"] = response.headers["Last-Modified"]
+
+        with self._lock:
+            self.cache[url] = entry
+
+        return data, links, False
+
+    def paginate(self, path: str, params: dict | None = None) -> list:
+        items = []
+        url, query = path, {"per_page": PER_PAGE, **(params or {})}
+
+        while url:
+            data, links, _ = self.get(url, query)
+            items.extend(data)
+            url, query = links.get("next"), None
+
+        return items
+
+    def count(self, path: str, params: dict | None = None) -> int:
+        # Com per_page=1, o número da última página no Link é o total de itens.
+        data, links, _ = self.get(path, {**(params or {}), "per_page": 1})
+        last = links.get("last")
+        if last:
+            return int(parse_qs(urlparse(last).query)["page"][0])
+        return len(data)
+
+    def map(self, fn, items) -> list:
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(fn, items))
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "rate_limit_waits": self.limiter.waits,
+        }
+
+# =========================
+# COLETA
+# =========================
+
+def repo_doc_id(full_name: str) -> str:
+    return full_name.replace("/", "__")
+
+def is_unchanged(repo: dict, previous: dict | None) -> bool:
+    return bool(
+        previous
+        and repo.get("pushed_at")
+        and previous.get("pushed_at") == repo["pushed_at"]
+        and "languages" in previous
+    )
+
+def fetch_repo(client: GitHubClient, repo: dict, previous: dict | None = None) -> dict:
+    full_name = repo["full_name"]
+
+    # Bytes por linguagem e commits só mudam com push: reaproveita o índice.
+    if is_unchanged(repo, previous):
+        languages = previous["languages"]
+        commits = previous.get("commits", 0)
+    else:
+        languages, _, _ = client.get(f"/repos/{full_name}/languages")
+        commits = client.count(f"/repos/{full_name}/commits")
+
+    pulls = client.count(f"/repos/{full_name}/pulls", {"state": "all"})
+    # /issues inclui pull requests.
+    issues = max(0, client.count(f"/repos/{full_name}/issues", {"state": "all"}) - pulls)
+
+    return {
+        "owner": user_key(repo["owner"]["login"]),
+        "name": repo["name"],
+        "full_name": full_name,
+        "fork": repo.get("fork", False),
+        "stars": repo.get("stargazers_count", 0),
+        "forks": repo.get("forks_count", 0),
+        "language": repo.get("language"),
+        "languages": languages,
+        "commits": commits,
+        "pulls": pulls,
+        "issues": issues,
+        "pushed_at": repo.get("pushed_at"),
+    }
+
+# Devolve (documentos, repositórios que falharam). Um erro em um repositório
+# (404 se foi renomeado/apagado depois da listagem, 403/451 se o acesso foi
+# bloqueado) não interrompe os demais: o documento anterior é mantido.
+def fetch_user_repos(client: GitHubClient, username: str, existing: dict | None = None) -> tuple:
+    existing = existing or {}
+    repos = client.paginate(f"/users/{username}/repos", {"type": "owner", "sort": "full_name"})
+    failed = []
+
+    def fetch(repo):
+        previous = existing.get(repo_doc_id(repo["full_name"]))
+        try:
+            return fetch_repo(client, repo, previous)
+        except requests.RequestException as exc:
+            logger.warning("ingest: falha ao coletar %s: %s", repo["full_name"], exc)
+            failed.append(repo["full_name"])
+            if previous is None:
+                return None
+            return {k: v for k, v in previous.items() if k != "ingested_at"}
+
+    docs = [doc for doc in client.map(fetch, repos) if doc is not None]
+    return docs, sorted(failed)
+
+# =========================
+# ESCRITA NO FIRESTORE
+# =========================
+
+def load_existing(db, username: str) -> dict:
+    query = db.collection(REPOS_COLLECTION).where(filter=firestore.FieldFilter("owner", "==", user_key(username)))
+    return {snap.id: snap.to_dict() for snap in query.stream()}
+
+# Com `summary`, cada batch leva também o Increment do resumo correspondente
+# às suas próprias escritas.
+def write_repos(db, docs: list, existing: dict, summary=None) -> dict:
+    collection = db.collection(REPOS_COLLECTION)
+    now = datetime.now(timezone.utc)
+
+    ops = []
+    fresh = set()
+    for doc in docs:
+        doc_id = repo_doc_id(doc["full_name"])
+        fresh.add(doc_id)
+
+        previous = {k: v for k, v in (existing.get(doc_id) or {}).items() if k != "ingested_at"}
+        # Documento idêntico: não grava.
+        if previous != doc:
+            ops.append(("set", doc_id, {**doc, "ingested_at": now}))
+
+    written = len(ops)
+    stale = sorted(set(existing) - fresh)
+    ops += [("delete", doc_id, None) for doc_id in stale]
+
+    for start in range(0, len(ops), BATCH_SIZE):
+        batch = db.batch()
+        before, after = [], []
+        for op, doc_id, data in ops[start:start + BATCH_SIZE]:
+            ref = collection.document(doc_id)
+            if doc_id in existing:
+                before.append(existing[doc_id])
+            if op == "set":
+                batch.set(ref, data)
+                after.append(data)
+            else:
+                batch.delete(ref)
+
+        update = delta_update(summary_delta(before, after)) if summary is not None else None
+        if update:
+            batch.update(summary, update)
+        batch.commit()
+
+    return {"written": written, "unchanged": len(fresh) - written, "deleted": len(stale)}
+
+def ingest_user(client: GitHubClient, db, username: str) -> dict:
+    with collect() as timings:
+        with stage("load_existing"):
+            existing = load_existing(db, username)
+        with stage("fetch"):
+            docs, failed = fetch_user_repos(client, username, existing)
+        reused = sum(1 for doc in docs if is_unchanged(doc, existing.get(repo_doc_id(doc["full_name"]))))
+
+        # Resumo válido: recebe só os deltas. Ausente ou vencido: recalculado
+        # a partir de `docs`, o conjunto completo após a escrita.
+        ref = summary_ref(db, username)
+        with stage("summary_read"):
+            incremental = not is_stale(ref.get().to_dict())
+        with stage("write"):
+            written = write_repos(db, docs, existing, ref if incremental else None)
+        if not incremental:
+            write_summary(db, username, docs)
+
+    return {
+        "user": username,
+        "languages_reused": reused,
+        "repos": len(docs),
+        "summary": "delta" if incremental else "rebuilt",
+        "failed": failed,
+        **written,
+        **client.stats(),
+        "timings_ms": {name: round(ms, 1) for name, ms in timings.as_ms().items()},
+    }
+
+# =========================
+# CLI
+# =========================
+
+def load_cache(path: Path | None) -> dict:
+    if path and path.exists():
+        return json.loads(path.read_text())
+    return {}
+
+def save_cache(path: Path | None, cache: dict) -> None:
+    if path:
+        path.write_text(json.dumps(cache, sort_keys=True))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingere repositórios do GitHub na coleção `repos` do Firestore.")
+    parser.add_argument("usernames", nargs="+")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--base-url", default=os.environ.get("GITHUB_API_URL", API_URL))
+    parser.add_argument("--cache-file", type=Path, default=Path(".cache_github_http.json"),
+                        help="ETags/Last-Modified das respostas anteriores")
+    parser.add_argument("--min-remaining", type=int, default=50,
+                        help="pausa até o reset quando a cota restante chega a este valor")
+    args = parser.parse_args(argv)
+
+    initialize_app()
+    db = firestore.client()
+
+    cache = load_cache(args.cache_file)
+    client = GitHubClient(
+        token=os.environ.get("GITHUB_TOKEN"),
+        base_url=args.base_url,
+        workers=args.workers,
+        cache=cache,
+        limiter=RateLimiter(min_remaining=args.min_remaining),
+    )
+
+    # Um usuário com erro não impede os seguintes, e o cache das respostas já
+    # obtidas é salvo mesmo se a execução for interrompida.
+    failures = 0
+    try:
+        for username in args.usernames:
+            try:
+                print(json.dumps(ingest_user(client, db, username)))
+            except requests.RequestException:
+                logger.exception("ingest: falha ao ingerir %s", username)
+                failures += 1
+    finally:
+        save_cache(args.cache_file, cache)
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,122 @@
 from firebase_functions import https_fn
 from firebase_functions.options import set_global_options
-from firebase_admin import initialize_app, firestore
 from collections import Counter
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import hmac
+import html
+import json
+import logging
+import os
+import re
+import sys
+from threading import Lock
+
+from cache import RenderCache
+from compression import compress, negotiate
+from summary import (
+    LANG_WEIGHTS,
+    language_weights,
+    load_summaries,
+    load_summary,
+    rebuild_summary,
+    summary_version,
+)
+from template import (
+    BAR_GAP,
+    BAR_HEIGHT,
+    BAR_SOURCE,
+    CENTER_X,
+    DASHBOARD_SOURCE,
+    EMPTY_SOURCE,
+    MAX_BARS,
+    MAX_WIDTH,
+    START_Y,
+    DashboardTemplate,
+    minify_svg,
+    top_languages,
+)
+from timing import Histograms, Timings, collect, stage, submit_timed
 
 # =========================
 # CONFIGURAÇÃO GLOBAL
 # =========================
 
 set_global_options(max_instances=10)
-initialize_app()
+
+# Incrementar quando o layout do SVG mudar, para invalidar ETags antigas.
+RENDER_VERSION = "3"
+
+# Cache-Control das respostas: max-age vale para o navegador, s-maxage e
+# stale-while-revalidate para a CDN do Firebase Hosting (rewrite /api/**).
+SVG_MAX_AGE = int(os.environ.get("SVG_MAX_AGE", "0"))
+SVG_S_MAXAGE = int(os.environ.get("SVG_S_MAXAGE", "300"))
+SVG_STALE_WHILE_REVALIDATE = int(os.environ.get("SVG_STALE_WHILE_REVALIDATE", "86400"))
+VERSION_S_MAXAGE = int(os.environ.get("VERSION_S_MAXAGE", "60"))
+# URLs com ?v=<token da versão atual> nunca mudam de conteúdo.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "25"))
+BATCH_WORKERS = 8
+
+# Observabilidade: Server-Timing e uma linha de log JSON por requisição
+# ficam ligados por padrão; histogramas em memória e o endpoint de debug
+# (?debug=timings com X-Debug-Token) só quando configurados.
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "1") == "1"
+REQUEST_LOGS = os.environ.get("REQUEST_LOGS", "1") == "1"
+TIMING_HISTOGRAMS = os.environ.get("TIMING_HISTOGRAMS", "0") == "1"
+DEBUG_TOKEN = os.environ.get("DEBUG_TOKEN", "")
+TIMINGS_ENABLED = SERVER_TIMING or REQUEST_LOGS or TIMING_HISTOGRAMS
+
+# Logins do GitHub: letras, números e hífens.
+VALID_USERNAME = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})\Z")
+
+# Todo log do módulo (requisições e exceções) sai como uma linha JSON no
+# stdout, que o Cloud Logging lê como log estruturado.
+class JsonLogFormatter(logging.Formatter):
+    def format(self, record) -> str:
+        message = record.getMessage()
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return json.dumps({
+            "severity": record.levelname,
+            "message": message,
+            **getattr(record, "fields", {}),
+        }, default=str)
+
+logger = logging.getLogger(__name__)
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(JsonLogFormatter())
+logger.addHandler(_log_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+# =========================
+# CLIENTE FIRESTORE
+# =========================
+
+# Criado na primeira requisição e reaproveitado pela instância inteira.
+_db = None
+_db_lock = Lock()
+
+def get_db():
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                from firebase_admin import firestore, initialize_app
+
+                initialize_app()
+                _db = firestore.client()
+    return _db
+
+svg_cache = RenderCache(
+    max_entries=int(os.environ.get("SVG_CACHE_SIZE", "256")),
+    ttl=float(os.environ.get("SVG_CACHE_TTL", "300")),
+)
+
+# Por instância: cada instância do Cloud Run acumula os seus.
+histograms = Histograms()
 
 # =========================
 # CORES POR LINGUAGEM
@@ -105,6 +211,8 @@ THEMES = {
     },
 }
 
+dashboard_template = DashboardTemplate(THEMES, LANG_COLORS, minify=True)
+
 # =========================
 # ETag
 # =========================
@@ -112,161 +220,417 @@ THEMES = {
 def make_etag(svg: str) -> str:
     return hashlib.md5(svg.encode("utf-8")).hexdigest()
 
+def make_version_etag(*parts: str) -> str:
+    key = ":".join((RENDER_VERSION, *parts))
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+# Inclui RENDER_VERSION: uma URL ?v= imutável não pode sobreviver a uma
+# mudança de layout.
+def data_token(version: str) -> str:
+    return hashlib.md5(f"{RENDER_VERSION}:{version}".encode("utf-8")).hexdigest()[:12]
+
+def format_etag(etag: str, encoding: str) -> str:
+    if encoding == "identity":
+        return f'"{etag}"'
+    return f'"{etag}-{encoding}"'
+
+def etag_matches(header: str, etag: str) -> bool:
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # Aceita qualquer codificação da mesma versão (e ETags antigas sem aspas).
+        candidate = candidate.removeprefix("W/").strip('"')
+        if candidate.split("-", 1)[0] == etag:
+            return True
+    return False
+
+def cache_control(versioned: bool) -> str:
+    if versioned:
+        return IMMUTABLE_CACHE_CONTROL
+    return (
+        f"public, max-age={SVG_MAX_AGE}, s-maxage={SVG_S_MAXAGE}, "
+        f"stale-while-revalidate={SVG_STALE_WHILE_REVALIDATE}"
+    )
+
 # =========================
 # SVG COMPONENTES
 # =========================
 
+# Versões de referência: formatam diretamente as mesmas fontes que
+# template.py compila por tema.
+
 def render_lang_bars(counter: Counter, center_x: int, start_y: int, max_width: int, theme: dict) -> str:
     total = sum(counter.values())
 
     if total == 0:
-        return (
-            f'<text x="{center_x}" y="{start_y}" '
-            f'fill="{theme["text"]}" text-anchor="middle" font-size="14">'
-            f'No language data available.</text>'
-        )
+        return EMPTY_SOURCE.format(**theme, center_x=center_x, start_y=start_y)
 
-    top = counter.most_common(5)
-    y = start_y
-    gap = 26
-    bar_h = 10
     left = center_x - max_width // 2
     svg = ""
 
-    for i, (lang, val) in enumerate(top):
+    for i, (lang, val) in enumerate(top_languages(counter, MAX_BARS)):
+        y = start_y + i * BAR_GAP
         pct = (val / total) * 100
-        width = max_width * (pct / 100)
-        color = LANG_COLORS.get(lang, LANG_COLORS["Other"])
-        delay = 0.2 + i * 0.15
-
-        svg += f"""
-<text x="{left - 12}" y="{y}" fill="{theme['text']}" font-size="12" text-anchor="end">
-  {lang}
-</text>
-<rect x="{left}" y="{y - 9}" width="{max_width}" height="{bar_h}" rx="5" fill="{theme['bar_bg']}"/>
-<rect x="{left}" y="{y - 9}" width="0" height="{bar_h}" rx="5" fill="{color}">
-  <animate attributeName="width" from="0" to="{width}" dur="0.8s" begin="{delay}s" fill="freeze"/>
-</rect>
-<text x="{left + max_width + 10}" y="{y}" fill="{theme['text']}" font-size="12">
-  {pct:.1f}%
-</text>
-"""
-        y += gap
+        svg += BAR_SOURCE.format(
+            **theme,
+            label_x=left - 12,
+            y=y,
+            bar_y=y - 9,
+            left=left,
+            max_width=max_width,
+            bar_h=BAR_HEIGHT,
+            delay=0.2 + i * 0.15,
+            pct_x=left + max_width + 10,
+            lang=html.escape(lang),
+            color=LANG_COLORS.get(lang, LANG_COLORS["Other"]),
+            width=max_width * (pct / 100),
+            pct=f"{pct:.1f}",
+        )
 
     return svg
 
 def build_combined_svg(user: dict, repos: list, langs: Counter, theme: dict) -> str:
     stars = sum(r.get("stars", 0) for r in repos)
     forks = sum(r.get("forks", 0) for r in repos)
-    user_name = user.get("name") or user.get("login", "GitHub User")
-
-    return f"""
-<svg viewBox="0 0 900 380" xmlns="http://www.w3.org/2000/svg" opacity="0">
-<style>
-.stat-text {{
-  font-family: -apple-system, BlinkMacSystemFont, "Segoe UI",
-               Roboto, Helvetica, Arial, sans-serif;
-}}
-</style>
+    return build_dashboard_svg(user, len(repos), stars, forks, langs, theme)
+
+def build_dashboard_svg(user: dict, repo_count: int, stars: int, forks: int, langs: Counter, theme: dict) -> str:
+    return DASHBOARD_SOURCE.format(
+        **theme,
+        user_name=html.escape(user.get("name") or user.get("login", "GitHub User")),
+        repo_count=repo_count,
+        stars=stars,
+        forks=forks,
+        lang_count=len(langs),
+        bars=render_lang_bars(langs, CENTER_X, START_Y, MAX_WIDTH, theme),
+    )
+
+def build_grid_svg(entries: list, theme: dict, weight: str = "repos") -> str:
+    cols = 1 if len(entries) == 1 else 2
+    cell_w, cell_h, pad, header = 430, 240, 20, 70
+    rows = -(-len(entries) // cols)
+    width = pad + cols * (cell_w + pad)
+    height = header + rows * (cell_h + pad)
+
+    # `entries` inclui os logins rejeitados por VALID_USERNAME: escapar sempre.
+    cells = []
+    for i, (username, summary) in enumerate(entries):
+        x = pad + (i % cols) * (cell_w + pad)
+        y = header + (i // cols) * (cell_h + pad)
+
+        if summary is None:
+            body = (
+                f'<text x="{x + cell_w // 2}" y="{y + cell_h // 2}" fill="{theme["text"]}" '
+                f'text-anchor="middle" font-size="13">Dados indisponíveis.</text>'
+            )
+        else:
+            langs = language_weights(summary, weight)
+            body = f"""
+<text x="{x + 20}" y="{y + 60}" fill="{theme['text']}" font-size="13">
+  📦 {summary['repos']} · ⭐ {summary['stars']} · 🍴 {summary['forks']} · 🧠 {len(langs)}
+</text>
+{render_lang_bars(langs, x + cell_w // 2 + 20, y + 100, 220, theme)}
+"""
 
-<animate attributeName="opacity" from="0" to="1" dur="0.6s" fill="freeze"/>
+        cells.append(f"""
+<rect x="{x}" y="{y}" width="{cell_w}" height="{cell_h}" rx="18"
+      fill="{theme['bar_bg']}" stroke="{theme['border']}" stroke-width="2"/>
+<text x="{x + 20}" y="{y + 34}" fill="{theme['title']}" font-size="18" font-weight="bold">
+  #{i + 1} {html.escape(username)}
+</text>
+{body}
+""")
 
+    return f"""
+<svg viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">
 <rect width="100%" height="100%" rx="28"
       fill="{theme['bg']}"
       stroke="{theme['border']}"
       stroke-width="4"/>
 
-<defs>
-  <radialGradient id="logoAura" cx="50%" cy="50%" r="60%">
-    <stop offset="0%" stop-color="{theme['accent']}" stop-opacity="0.35"/>
-    <stop offset="100%" stop-color="{theme['accent']}" stop-opacity="0"/>
-  </radialGradient>
-</defs>
-
-<circle cx="90" cy="95" r="48" fill="url(#logoAura)">
-  <animate attributeName="opacity" from="0.35" to="0.65"
-           dur="2.4s" repeatCount="indefinite"/>
-</circle>
-
-<circle cx="90" cy="95" r="34" fill="{theme['bar_bg']}"/>
-<circle cx="90" cy="95" r="34" fill="none"
-        stroke="{theme['accent']}" stroke-width="4"/>
-
-<text x="90" y="106" text-anchor="middle"
-      fill="{theme['accent']}" font-size="30"
-      font-weight="bold" letter-spacing="5">&lt;/&gt;</text>
-
-<text x="160" y="68" fill="{theme['title']}"
-      font-size="22" font-weight="bold">
-  {user_name} · Developer Dashboard
+<text x="{width // 2}" y="46" text-anchor="middle"
+      fill="{theme['accent']}" font-size="22" font-weight="bold">
+  Team Dashboard
 </text>
+{"".join(cells)}
+</svg>
+"""
 
-<text x="160" y="92" fill="{theme['text']}" font-size="13">
-  Da faísca da ideia à Constelação do código.
-</text>
+# =========================
+# HTTP FUNCTION
+# =========================
 
-<text x="160" y="112" fill="{theme['text']}" font-size="13">
-  Construindo um Universo de possibilidades!!
-</text>
+def parse_options(req) -> tuple:
+    theme_name = req.args.get("theme", "tokyonight")
+    if theme_name not in THEMES:
+        theme_name = "tokyonight"
+    weight = req.args.get("weight", "repos")
+    if weight not in LANG_WEIGHTS:
+        weight = "repos"
+    return theme_name, weight
+
+def render_dashboard(key: tuple, summary: dict) -> tuple:
+    variants = svg_cache.get(key)
+    if variants is not None:
+        return variants, "HIT"
+
+    username, theme_name, weight, _ = key
+    with stage("render"):
+        langs = language_weights(summary, weight)
+        user = {"name": username, "login": username}
+        body = dashboard_template.render(
+            theme_name, user, summary["repos"], summary["stars"], summary["forks"], langs
+        )
+    variants = {"identity": body}
+    svg_cache.put(key, variants)
+    return variants, "MISS"
 
-<text x="160" y="145" fill="{theme['text']}" font-size="13">
-  📦 {len(repos)} Repositórios · ⭐ {stars} Stars · 🍴 {forks} Forks · 🧠 {len(langs)} Linguagens
-</text>
+def json_error(message: str, status: int = 400):
+    return https_fn.Response(
+        json.dumps({"error": message}),
+        status=status,
+        headers={"Content-Type": "application/json"},
+    )
 
-<circle cx="825" cy="95" r="46" fill="none" stroke="#2a2a2a" stroke-width="7"/>
-<circle cx="825" cy="95" r="46" fill="none"
-        stroke="{theme['accent']}" stroke-width="7"
-        stroke-dasharray="290" stroke-dashoffset="290"
-        transform="rotate(-90 825 95)">
-  <animate attributeName="stroke-dashoffset"
-           from="290" to="30" dur="1.4s" fill="freeze"/>
-</circle>
-
-<text x="825" y="112" text-anchor="middle"
-      fill="{theme['accent']}" font-size="34" font-weight="bold">A</text>
-
-<text x="450" y="210" text-anchor="middle"
-      fill="{theme['accent']}" font-size="16" font-weight="bold">
-  Top Languages
-</text>
+# =========================
+# OBSERVABILIDADE
+# =========================
 
-{render_lang_bars(langs, 450, 240, 360, theme)}
-</svg>
-"""
+def finish_request(response, timings: Timings, fields: dict):
+    if not timings.enabled:
+        return response
+
+    if SERVER_TIMING:
+        descriptions = {"cache": fields["cache"]} if "cache" in fields else {}
+        response.headers["Server-Timing"] = timings.server_timing(**descriptions)
+    if TIMING_HISTOGRAMS:
+        histograms.record(timings)
+    if REQUEST_LOGS:
+        logger.info("%s %s", fields["endpoint"], response.status_code, extra={"fields": {
+            **fields,
+            "status": response.status_code,
+            "bytes": response.content_length or 0,
+            "total_ms": round(timings.total_ms(), 3),
+            "stages_ms": {name: round(ms, 3) for name, ms in timings.as_ms().items()},
+        }})
+
+    return response
+
+def debug_response(req):
+    supplied = req.headers.get("X-Debug-Token", "").encode("utf-8")
+    if not DEBUG_TOKEN or not hmac.compare_digest(supplied, DEBUG_TOKEN.encode("utf-8")):
+        return json_error("não encontrado", 404)
+
+    return https_fn.Response(
+        json.dumps({
+            "histograms_enabled": TIMING_HISTOGRAMS,
+            "histograms_ms": histograms.snapshot(),
+            "svg_cache": svg_cache.stats(),
+        }),
+        headers={"Content-Type": "application/json", "Cache-Control": "no-store"},
+    )
 
 # =========================
-# HTTP FUNCTION
+# ENDPOINTS
 # =========================
 
 @https_fn.on_request()
 def statsSvg(req):
-    db = firestore.client()
+    if "debug" in req.args:
+        return debug_response(req)
 
-    username = req.args.get("username", "Domisnnet")
-    theme_name = req.args.get("theme", "tokyonight")
-    theme = THEMES.get(theme_name, THEMES["tokyonight"])
+    fields = {"endpoint": "statsSvg"}
+    with collect(TIMINGS_ENABLED) as timings:
+        response = serve_stats_svg(req, fields)
+    return finish_request(response, timings, fields)
 
-    repos = []
-    langs = Counter()
+def serve_stats_svg(req, fields: dict):
+    db = get_db()
+    ensure_warm(db)
 
-    for doc in db.collection("repos").stream():
-        data = doc.to_dict()
-        repos.append(data)
-        if data.get("language"):
-            langs[data["language"]] += 1
+    username = req.args.get("username", "Domisnnet")
+    if not VALID_USERNAME.match(username):
+        return json_error("login inválido")
+    theme_name, weight = parse_options(req)
+    fields.update(user=username, theme=theme_name, weight=weight)
+
+    summary = load_summary(db, username)
+    version = summary_version(summary)
+    token = data_token(version)
+    fields["repos"] = summary["repos"]
+
+    if req.args.get("format") == "version":
+        return https_fn.Response(
+            json.dumps({"username": username, "version": token}),
+            headers={
+                "Content-Type": "application/json",
+                "Cache-Control": f"public, max-age=0, s-maxage={VERSION_S_MAXAGE}",
+            },
+        )
 
-    user = {"name": username, "login": username}
-    svg = build_combined_svg(user, repos, langs, theme)
+    key = (username, theme_name, weight, version)
+    with stage("etag"):
+        etag = make_version_etag(*key)
+    encoding = negotiate(req.accept_encodings)
+    fields["encoding"] = encoding
+
+    headers = {
+        "Cache-Control": cache_control(req.args.get("v") == token),
+        "ETag": format_etag(etag, encoding),
+        "Vary": "Accept-Encoding",
+    }
+
+    # Só a ETag decide o 304: ela cobre layout, tema, peso e dados; a data do
+    # resumo sozinha não (por isso não há Last-Modified/If-Modified-Since).
+    if etag_matches(req.headers.get("If-None-Match", ""), etag):
+        fields["cache"] = "NOT_MODIFIED"
+        return https_fn.Response(status=304, headers=headers)
+
+    variants, cache_status = render_dashboard(key, summary)
+    fields["cache"] = cache_status
+
+    # Cada codificação é comprimida uma vez e guardada junto da entrada do cache.
+    if encoding not in variants:
+        with stage("compress"):
+            variants[encoding] = compress(variants["identity"], encoding)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    headers["Content-Type"] = "image/svg+xml; charset=utf-8"
+    headers["X-Cache"] = cache_status
+    return https_fn.Response(variants[encoding], headers=headers)
 
-    etag = make_etag(svg)
-    if req.headers.get("If-None-Match") == etag:
-        return https_fn.Response(status=304)
+@https_fn.on_request()
+def statsSvgBatch(req):
+    fields = {"endpoint": "statsSvgBatch"}
+    with collect(TIMINGS_ENABLED) as timings:
+        response = serve_stats_svg_batch(req, fields)
+    return finish_request(response, timings, fields)
+
+def serve_stats_svg_batch(req, fields: dict):
+    db = get_db()
+    ensure_warm(db)
+
+    raw = req.args.getlist("username") + ",".join(req.args.getlist("usernames")).split(",")
+    usernames = list(dict.fromkeys(u.strip() for u in raw if u.strip()))
+    theme_name, weight = parse_options(req)
+    output = req.args.get("format", "json")
+
+    if not usernames:
+        return json_error("informe ?usernames=a,b,c")
+    if len(usernames) > MAX_BATCH_SIZE:
+        return json_error(f"no máximo {MAX_BATCH_SIZE} usuários por requisição")
+    if output not in ("json", "grid"):
+        return json_error("format deve ser json ou grid")
+
+    fields.update(users=len(usernames), theme=theme_name, weight=weight, format=output)
+    errors = {u: "login inválido" for u in usernames if not VALID_USERNAME.match(u)}
+    valid = [u for u in usernames if u not in errors]
+    summaries = load_summaries(db, valid) if valid else {}
+
+    # Só resumos ausentes ou vencidos são reconstruídos (I/O no Firestore, em
+    # paralelo); nada é renderizado antes de a ETag decidir entre 200 e 304.
+    missing = [u for u in valid if summaries[u] is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(missing))) as pool:
+            futures = submit_timed(pool, lambda username: rebuild_summary(db, username), missing)
+        for username, future in futures.items():
+            try:
+                summaries[username] = future.result()
+            except Exception:
+                logger.exception("statsSvgBatch: falha ao carregar %s", username)
+                errors[username] = "falha ao carregar estatísticas"
+    results = {u: summaries[u] for u in valid if u not in errors}
+    fields["errors"] = len(errors)
+
+    versions = [f"{u}={summary_version(results[u])}" if u in results else f"{u}!" for u in usernames]
+    etag = make_version_etag(output, theme_name, weight, *versions)
+    encoding = negotiate(req.accept_encodings)
+    headers = {
+        "Cache-Control": cache_control(False),
+        "ETag": format_etag(etag, encoding),
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(req.headers.get("If-None-Match", ""), etag):
+        fields["cache"] = "NOT_MODIFIED"
+        return https_fn.Response(status=304, headers=headers)
+
+    body = build_batch_body(output, theme_name, weight, usernames, results, errors)
+    headers["Content-Type"] = "image/svg+xml; charset=utf-8" if output == "grid" else "application/json"
+
+    if encoding != "identity":
+        with stage("compress"):
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return https_fn.Response(body, headers=headers)
+
+def build_batch_body(output: str, theme_name: str, weight: str, usernames: list, results: dict, errors: dict) -> bytes:
+    if output == "grid":
+        with stage("render"):
+            ranked = sorted(results.items(), key=lambda item: -item[1]["stars"])
+            entries = ranked + [(u, None) for u in errors]
+            return minify_svg(build_grid_svg(entries, THEMES[theme_name], weight)).encode("utf-8")
+
+    # Dashboards individuais vêm do cache de render (estágio "render" em
+    # render_dashboard); aqui só a serialização.
+    dashboards = {}
+    for username in usernames:
+        if username in results:
+            summary = results[username]
+            variants, _ = render_dashboard((username, theme_name, weight, summary_version(summary)), summary)
+            dashboards[username] = variants["identity"].decode("utf-8")
+
+    with stage("encode"):
+        return json.dumps({
+            "theme": theme_name,
+            "weight": weight,
+            "dashboards": dashboards,
+            "errors": errors,
+        }).encode("utf-8")
 
-    return https_fn.Response(
-        svg,
-        headers={
-            "Content-Type": "image/svg+xml; charset=utf-8",
-            "Cache-Control": "no-cache",
-            "ETag": etag,
-        },
-    )
\ No newline at end of file
+# =========================
+# WARM-UP
+# =========================
+
+# Pré-carrega os resumos e todos os temas no cache de render.
+# Configurado por WARMUP_USERNAMES=a,b,c (ex.: junto com min_instances).
+WARMUP_USERNAMES = [u.strip() for u in os.environ.get("WARMUP_USERNAMES", "").split(",") if u.strip()]
+
+def warm_up(db, usernames: list) -> dict:
+    summaries = load_summaries(db, usernames)
+    warmed = 0
+
+    for username, summary in summaries.items():
+        summary = summary or rebuild_summary(db, username)
+        version = summary_version(summary)
+        user = {"name": username, "login": username}
+        with stage("render"):
+            rendered = dashboard_template.render_all(
+                user, summary["repos"], summary["stars"], summary["forks"], language_weights(summary)
+            )
+        for theme_name, body in rendered.items():
+            svg_cache.put((username, theme_name, "repos", version), {"identity": body})
+            warmed += 1
+
+    return {"users": len(summaries), "entries": warmed}
+
+# Roda uma vez por instância, na primeira requisição: nada de I/O no import,
+# que também acontece durante o deploy. Uma falha não derruba a requisição
+# nem é repetida.
+_warmed = not WARMUP_USERNAMES
+_warm_lock = Lock()
+
+def ensure_warm(db) -> None:
+    global _warmed
+    if _warmed:
+        return
+    with _warm_lock:
+        if _warmed:
+            return
+        _warmed = True
+        try:
+            warm_up(db, WARMUP_USERNAMES)
+        except Exception:
+            logger.exception("warm-up falhou; seguindo sem cache pré-carregado")
@@ -0,0 +1,145 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from compression import ENCODINGS, compress
+from main import THEMES, VALID_USERNAME, dashboard_template, get_db, make_version_etag
+from summary import language_weights, load_summary, summary_version
+from timing import collect, stage
+
+# =========================
+# CONFIGURAÇÃO
+# =========================
+
+OUTPUT_DIR = "dashboards"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+# Acima de 9 o brotli fica ~4x mais lento e quase não reduz SVGs deste tamanho.
+BROTLI_QUALITY = 9
+
+# =========================
+# RENDERIZAÇÃO
+# =========================
+
+def compress_variants(body: bytes) -> dict:
+    return {
+        encoding: compress(body, encoding, BROTLI_QUALITY if encoding == "br" else None)
+        for encoding in ENCODINGS
+    }
+
+def render_user(job: tuple) -> tuple:
+    username, summary = job
+    user = {"name": username, "login": username}
+    langs = language_weights(summary)
+
+    rendered = dashboard_template.render_all(user, summary["repos"], summary["stars"], summary["forks"], langs)
+    return username, {theme: (body, compress_variants(body)) for theme, body in rendered.items()}
+
+# =========================
+# ESCRITA
+# =========================
+
+def write_user(public: Path, username: str, rendered: dict, version: str) -> dict:
+    user_dir = public / OUTPUT_DIR / username
+    user_dir.mkdir(parents=True, exist_ok=True)
+
+    entries = {}
+    keep = set()
+    for theme, (body, variants) in rendered.items():
+        digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        name = f"{theme}.{digest}.svg"
+
+        files = {"svg": name}
+        (user_dir / name).write_bytes(body)
+        for encoding, data in variants.items():
+            suffix = ".gz" if encoding == "gzip" else ".br"
+            files[encoding] = name + suffix
+            (user_dir / (name + suffix)).write_bytes(data)
+        keep.update(files.values())
+
+        entries[theme] = {
+            **{key: f"{OUTPUT_DIR}/{username}/{file}" for key, file in files.items()},
+            "bytes": len(body),
+            "etag": make_version_etag(username, theme, "repos", version),
+            "data_version": version,
+        }
+
+    # Remove renderizações antigas do usuário; o manifesto só aponta para as novas.
+    for path in user_dir.iterdir():
+        if path.name not in keep:
+            path.unlink()
+
+    return entries
+
+def load_manifest(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"version": MANIFEST_VERSION, "dashboards": {}}
+
+def prerender(db, usernames: list, public: Path, workers: int | None = None) -> dict:
+    jobs = []
+    versions = {}
+    with stage("load"):
+        for username in usernames:
+            summary = load_summary(db, username)
+            versions[username] = summary_version(summary)
+            jobs.append((username, summary))
+
+    manifest_path = public / OUTPUT_DIR / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+
+    # Renderização (nos processos) e escrita se intercalam; medidas juntas.
+    with stage("render_write"), ProcessPoolExecutor(max_workers=workers) as pool:
+        for username, rendered in pool.map(render_user, jobs, chunksize=max(1, len(jobs) // 32)):
+            manifest["dashboards"][username] = write_user(public, username, rendered, versions[username])
+
+    manifest["version"] = MANIFEST_VERSION
+    manifest["generated_at"] = datetime.now(timezone.utc).isoformat()
+    manifest["themes"] = sorted(THEMES)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    return manifest
+
+# =========================
+# CLI
+# =========================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pré-renderiza dashboards de todos os usuários em todos os temas.")
+    parser.add_argument("usernames", nargs="*")
+    parser.add_argument("--users-file", type=Path, help="um login do GitHub por linha")
+    parser.add_argument("--public", type=Path, default=Path(__file__).resolve().parent.parent / "public")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dashboard", type=Path, help="grava também o SVG do primeiro usuário neste caminho")
+    parser.add_argument("--dashboard-theme", default="merko", choices=sorted(THEMES))
+    args = parser.parse_args(argv)
+
+    usernames = list(args.usernames)
+    if args.users_file:
+        usernames += [line.strip() for line in args.users_file.read_text().splitlines() if line.strip()]
+
+    invalid = [u for u in usernames if not VALID_USERNAME.match(u)]
+    if invalid:
+        parser.error(f"logins inválidos: {', '.join(invalid)}")
+    if not usernames:
+        parser.error("informe ao menos um usuário")
+
+    with collect() as timings:
+        manifest = prerender(get_db(), list(dict.fromkeys(usernames)), args.public, args.workers)
+
+    if args.dashboard:
+        entry = manifest["dashboards"][usernames[0]][args.dashboard_theme]
+        args.dashboard.write_bytes((args.public / entry["svg"]).read_bytes())
+
+    print(f"{len(usernames)} usuário(s) × {len(THEMES)} temas em {args.public / OUTPUT_DIR}")
+    print(" · ".join(f"{name} {ms:.0f} ms" for name, ms in timings.as_ms().items()))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+
+from timing import stage
+
+# =========================
+# CONFIGURAÇÃO
+# =========================
+
+REPOS_COLLECTION = "repos"
+SUMMARY_COLLECTION = "summaries"
+SUMMARY_SCHEMA = 2
+SUMMARY_MAX_AGE = timedelta(days=7)
+
+# "repos": um voto por repositório (linguagem principal).
+# "bytes": bytes por linguagem, somados do /languages de cada repositório.
+LANG_WEIGHTS = {"repos": "langs", "bytes": "lang_bytes"}
+
+# =========================
+# AGREGADOS
+# =========================
+
+# Logins do GitHub não diferenciam maiúsculas: `owner` nos repositórios e os
+# IDs dos resumos são gravados em minúsculas.
+def user_key(username: str) -> str:
+    return username.lower()
+
+def empty_summary() -> dict:
+    return {"stars": 0, "forks": 0, "repos": 0, "langs": {}, "lang_bytes": {}}
+
+def summarize_repos(repos: list) -> dict:
+    langs = Counter(r["language"] for r in repos if r.get("language"))
+    lang_bytes = Counter()
+    for r in repos:
+        lang_bytes.update(r.get("languages") or {})
+
+    return {
+        "stars": sum(r.get("stars", 0) for r in repos),
+        "forks": sum(r.get("forks", 0) for r in repos),
+        "repos": len(repos),
+        "langs": dict(langs),
+        "lang_bytes": dict(lang_bytes),
+    }
+
+def _counter_delta(old: dict, new: dict) -> dict:
+    delta = Counter(new)
+    delta.subtract(old)
+    return {key: n for key, n in delta.items() if n}
+
+# Diferença entre os repositórios antes e depois de um lote de escritas.
+def summary_delta(before: list, after: list) -> dict:
+    old = summarize_repos(before)
+    new = summarize_repos(after)
+
+    return {
+        "stars": new["stars"] - old["stars"],
+        "forks": new["forks"] - old["forks"],
+        "repos": new["repos"] - old["repos"],
+        "langs": _counter_delta(old["langs"], new["langs"]),
+        "lang_bytes": _counter_delta(old["lang_bytes"], new["lang_bytes"]),
+    }
+
+def is_stale(data: dict | None) -> bool:
+    if not data or data.get("schema") != SUMMARY_SCHEMA:
+        return True
+
+    rebuilt_at = data.get("rebuilt_at")
+    if rebuilt_at is None:
+        return True
+
+    return datetime.now(timezone.utc) - rebuilt_at > SUMMARY_MAX_AGE
+
+def summary_version(summary: dict) -> str:
+    updated_at = summary.get("updated_at")
+    if updated_at is not None:
+        return updated_at.isoformat()
+
+    payload = {k: summary[k] for k in ("stars", "forks", "repos", "langs", "lang_bytes")}
+    return hashlib.md5(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _normalize(data: dict) -> dict:
+    summary = empty_summary()
+    summary.update({k: data[k] for k in ("stars", "forks", "repos", "updated_at") if k in data})
+    for field in LANG_WEIGHTS.values():
+        summary[field] = {lang: n for lang, n in (data.get(field) or {}).items() if n > 0}
+    return summary
+
+def language_weights(summary: dict, weight: str = "repos") -> Counter:
+    return Counter(summary[LANG_WEIGHTS.get(weight, "langs")])
+
+# =========================
+# LEITURA / RECONSTRUÇÃO
+# =========================
+
+# O SDK do Firestore é importado só quando usado, para não pesar no cold start.
+
+def summary_ref(db, username: str):
+    return db.collection(SUMMARY_COLLECTION).document(user_key(username))
+
+def rebuild_summary(db, username: str) -> dict:
+    from firebase_admin import firestore
+
+    query = db.collection(REPOS_COLLECTION).where(
+        filter=firestore.FieldFilter("owner", "==", user_key(username))
+    )
+    with stage("stream"):
+        repos = [doc.to_dict() for doc in query.stream()]
+
+    # Login sem repositórios (ou digitado errado) não é gravado: uma
+    # requisição anônima não deve criar documentos.
+    return write_summary(db, username, repos, persist_empty=False)
+
+# Também usado pela ingestão quando não há resumo válido para incrementar.
+def write_summary(db, username: str, repos: list, persist_empty: bool = True) -> dict:
+    with stage("aggregate"):
+        summary = summarize_repos(repos)
+
+    if summary["repos"] or persist_empty:
+        now = datetime.now(timezone.utc)
+        summary.update(schema=SUMMARY_SCHEMA, rebuilt_at=now, updated_at=now)
+        with stage("summary_write"):
+            summary_ref(db, username).set(summary)
+
+    return _normalize(summary)
+
+def load_summary(db, username: str) -> dict:
+    with stage("summary_read"):
+        snap = summary_ref(db, username).get()
+    data = snap.to_dict() if snap.exists else None
+
+    if is_stale(data):
+        return rebuild_summary(db, username)
+
+    return _normalize(data)
+
+# Uma única leitura em lote; resumos ausentes ou vencidos voltam como None
+# para o chamador reconstruir.
+def load_summaries(db, usernames: list) -> dict:
+    keys = {username: user_key(username) for username in usernames}
+    refs = [db.collection(SUMMARY_COLLECTION).document(key) for key in set(keys.values())]
+    with stage("summary_read"):
+        found = {snap.id: snap.to_dict() for snap in db.get_all(refs) if snap.exists}
+
+    return {
+        username: None if is_stale(found.get(key)) else _normalize(found[key])
+        for username, key in keys.items()
+    }
+
+# =========================
+# ATUALIZAÇÃO INCREMENTAL
+# =========================
+
+# Update com Increment que aplica `delta` ao resumo, ou None se nada mudou.
+# A ingestão o grava no mesmo batch das escritas que o originaram: delta e
+# repositórios são atômicos, e uma reexecução calcula contra o que já foi
+# gravado, sem contar duas vezes. rebuilt_at não muda, então o resumo ainda
+# é recalculado do zero a cada SUMMARY_MAX_AGE.
+def delta_update(delta: dict) -> dict | None:
+    if not any(delta.values()):
+        return None
+
+    from firebase_admin import firestore
+    from google.cloud.firestore_v1.field_path import FieldPath
+
+    update = {
+        "stars": firestore.Increment(delta["stars"]),
+        "forks": firestore.Increment(delta["forks"]),
+        "repos": firestore.Increment(delta["repos"]),
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+    for field in LANG_WEIGHTS.values():
+        for lang, n in delta[field].items():
+            update[FieldPath(field, lang).to_api_repr()] = firestore.Increment(n)
+    return update
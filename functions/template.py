@@ -0,0 +1,252 @@
+from collections import Counter
+import html
+import re
+from string import Formatter
+
+# =========================
+# FONTES DOS TEMPLATES
+# =========================
+
+# Fonte única do layout: DashboardTemplate as compila por tema, e
+# build_dashboard_svg/render_lang_bars em main.py as formatam diretamente.
+
+DASHBOARD_SOURCE = """
+<svg viewBox="0 0 900 380" xmlns="http://www.w3.org/2000/svg" opacity="0">
+<style>
+.stat-text {{
+  font-family: -apple-system, BlinkMacSystemFont, "Segoe UI",
+               Roboto, Helvetica, Arial, sans-serif;
+}}
+</style>
+
+<animate attributeName="opacity" from="0" to="1" dur="0.6s" fill="freeze"/>
+
+<rect width="100%" height="100%" rx="28"
+      fill="{bg}"
+      stroke="{border}"
+      stroke-width="4"/>
+
+<defs>
+  <radialGradient id="logoAura" cx="50%" cy="50%" r="60%">
+    <stop offset="0%" stop-color="{accent}" stop-opacity="0.35"/>
+    <stop offset="100%" stop-color="{accent}" stop-opacity="0"/>
+  </radialGradient>
+</defs>
+
+<circle cx="90" cy="95" r="48" fill="url(#logoAura)">
+  <animate attributeName="opacity" from="0.35" to="0.65"
+           dur="2.4s" repeatCount="indefinite"/>
+</circle>
+
+<circle cx="90" cy="95" r="34" fill="{bar_bg}"/>
+<circle cx="90" cy="95" r="34" fill="none"
+        stroke="{accent}" stroke-width="4"/>
+
+<text x="90" y="106" text-anchor="middle"
+      fill="{accent}" font-size="30"
+      font-weight="bold" letter-spacing="5">&lt;/&gt;</text>
+
+<text x="160" y="68" fill="{title}"
+      font-size="22" font-weight="bold">
+  {user_name} · Developer Dashboard
+</text>
+
+<text x="160" y="92" fill="{text}" font-size="13">
+  Da faísca da ideia à Constelação do código.
+</text>
+
+<text x="160" y="112" fill="{text}" font-size="13">
+  Construindo um Universo de possibilidades!!
+</text>
+
+<text x="160" y="145" fill="{text}" font-size="13">
+  📦 {repo_count} Repositórios · ⭐ {stars} Stars · 🍴 {forks} Forks · 🧠 {lang_count} Linguagens
+</text>
+
+<circle cx="825" cy="95" r="46" fill="none" stroke="#2a2a2a" stroke-width="7"/>
+<circle cx="825" cy="95" r="46" fill="none"
+        stroke="{accent}" stroke-width="7"
+        stroke-dasharray="290" stroke-dashoffset="290"
+        transform="rotate(-90 825 95)">
+  <animate attributeName="stroke-dashoffset"
+           from="290" to="30" dur="1.4s" fill="freeze"/>
+</circle>
+
+<text x="825" y="112" text-anchor="middle"
+      fill="{accent}" font-size="34" font-weight="bold">A</text>
+
+<text x="450" y="210" text-anchor="middle"
+      fill="{accent}" font-size="16" font-weight="bold">
+  Top Languages
+</text>
+
+{bars}
+</svg>
+"""
+
+BAR_SOURCE = """
+<text x="{label_x}" y="{y}" fill="{text}" font-size="12" text-anchor="end">
+  {lang}
+</text>
+<rect x="{left}" y="{bar_y}" width="{max_width}" height="{bar_h}" rx="5" fill="{bar_bg}"/>
+<rect x="{left}" y="{bar_y}" width="0" height="{bar_h}" rx="5" fill="{color}">
+  <animate attributeName="width" from="0" to="{width}" dur="0.8s" begin="{delay}s" fill="freeze"/>
+</rect>
+<text x="{pct_x}" y="{y}" fill="{text}" font-size="12">
+  {pct}%
+</text>
+"""
+
+EMPTY_SOURCE = (
+    '<text x="{center_x}" y="{start_y}" '
+    'fill="{text}" text-anchor="middle" font-size="14">'
+    'No language data available.</text>'
+)
+
+# Geometria fixa do dashboard: render_lang_bars(langs, CENTER_X, START_Y, MAX_WIDTH, theme)
+CENTER_X = 450
+START_Y = 240
+MAX_WIDTH = 360
+BAR_GAP = 26
+BAR_HEIGHT = 10
+MAX_BARS = 5
+
+# Empates pelo nome da linguagem: a ordem dos mapas muda entre o resumo
+# recém-calculado e o lido do Firestore (chaves ordenadas).
+def top_languages(langs: Counter, n: int = MAX_BARS) -> list:
+    return sorted(langs.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+# =========================
+# COMPILAÇÃO
+# =========================
+
+# Minificação determinística: remove espaços entre tags e nas bordas dos
+# textos (o SVG já os ignora) e colapsa o restante em um único espaço.
+def minify_svg(text: str) -> str:
+    text = re.sub(r">\s+", ">", text)
+    text = re.sub(r"\s+<", "<", text)
+    return re.sub(r"\s+", " ", text)
+
+# Divide `source` em segmentos de bytes estáticos e slots dinâmicos. Campos
+# presentes em `static` são resolvidos já na compilação.
+def compile_source(source: str, static: dict, minify: bool = False) -> tuple:
+    segments = []
+    slots = []
+    literal = ""
+    finish = minify_svg if minify else str
+
+    for text, field, spec, _ in Formatter().parse(source):
+        literal += text
+        if field is None:
+            continue
+        if field in static:
+            literal += format(static[field], spec)
+        else:
+            segments.append(finish(literal).encode("utf-8"))
+            slots.append(field)
+            literal = ""
+
+    segments.append(finish(literal).encode("utf-8"))
+    return tuple(segments), tuple(slots)
+
+def _splice(compiled: tuple, values: dict, out: list) -> None:
+    segments, slots = compiled
+    for segment, slot in zip(segments, slots):
+        out.append(segment)
+        out.append(values[slot])
+    out.append(segments[-1])
+
+# =========================
+# RENDERER
+# =========================
+
+class DashboardTemplate:
+    def __init__(self, themes: dict, lang_colors: dict, fallback_color: str = "Other", minify: bool = False):
+        self.minify = minify
+        self.colors = {lang: color.encode("utf-8") for lang, color in lang_colors.items()}
+        self.default_color = self.colors[fallback_color]
+        self.themes = {name: self._compile_theme(theme) for name, theme in themes.items()}
+
+    def _compile_theme(self, theme: dict) -> dict:
+        left = CENTER_X - MAX_WIDTH // 2
+        bars = []
+
+        for i in range(MAX_BARS):
+            y = START_Y + i * BAR_GAP
+            bars.append(compile_source(BAR_SOURCE, {
+                **theme,
+                "label_x": left - 12,
+                "y": y,
+                "bar_y": y - 9,
+                "left": left,
+                "max_width": MAX_WIDTH,
+                "bar_h": BAR_HEIGHT,
+                "delay": 0.2 + i * 0.15,
+                "pct_x": left + MAX_WIDTH + 10,
+            }, self.minify))
+
+        empty_static = {**theme, "center_x": CENTER_X, "start_y": START_Y}
+        empty_segments, _ = compile_source(EMPTY_SOURCE, empty_static, self.minify)
+
+        return {
+            "dashboard": compile_source(DASHBOARD_SOURCE, theme, self.minify),
+            "bars": bars,
+            "empty": empty_segments[0],
+        }
+
+    def _fields(self, user: dict, repo_count: int, stars: int, forks: int, langs: Counter) -> tuple:
+        langs = langs if isinstance(langs, Counter) else Counter(langs)
+        # Texto vindo da requisição: escapado antes de entrar no SVG.
+        user_name = html.escape(user.get("name") or user.get("login", "GitHub User"))
+        total = sum(langs.values())
+
+        bars = []
+        if total != 0:
+            for lang, val in top_languages(langs):
+                pct = (val / total) * 100
+                width = MAX_WIDTH * (pct / 100)
+                bars.append({
+                    "lang": html.escape(lang).encode("utf-8"),
+                    "color": self.colors.get(lang, self.default_color),
+                    "width": str(width).encode("utf-8"),
+                    "pct": f"{pct:.1f}".encode("utf-8"),
+                })
+
+        values = {
+            "user_name": user_name.encode("utf-8"),
+            "repo_count": str(repo_count).encode("utf-8"),
+            "stars": str(stars).encode("utf-8"),
+            "forks": str(forks).encode("utf-8"),
+            "lang_count": str(len(langs)).encode("utf-8"),
+        }
+        return values, bars
+
+    def _assemble(self, theme_name: str, values: dict, bars: list) -> bytes:
+        compiled = self.themes[theme_name]
+        bar_parts = []
+
+        if bars:
+            for template, bar in zip(compiled["bars"], bars):
+                _splice(template, bar, bar_parts)
+        else:
+            bar_parts.append(compiled["empty"])
+
+        segments, slots = compiled["dashboard"]
+        out = []
+        for segment, slot in zip(segments, slots):
+            out.append(segment)
+            if slot == "bars":
+                out.extend(bar_parts)
+            else:
+                out.append(values[slot])
+        out.append(segments[-1])
+
+        # Um único join: o buffer final é alocado uma vez com o tamanho exato.
+        return b"".join(out)
+
+    def render(self, theme_name: str, user: dict, repo_count: int, stars: int, forks: int, langs: Counter) -> bytes:
+        return self._assemble(theme_name, *self._fields(user, repo_count, stars, forks, langs))
+
+    def render_all(self, user: dict, repo_count: int, stars: int, forks: int, langs: Counter) -> dict:
+        values, bars = self._fields(user, repo_count, stars, forks, langs)
+        return {name: self._assemble(name, values, bars) for name in self.themes}
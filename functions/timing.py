@@ -0,0 +1,146 @@
+from bisect import bisect_left
+from concurrent.futures import wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+import time
+
+# =========================
+# ESTÁGIOS
+# =========================
+
+# Uso: `with collect() as timings:` ativa a coleta para o contexto atual;
+# qualquer código chamado dentro dele marca estágios com `with stage("x"):`.
+# Sem coleta ativa, stage() devolve um objeto no-op
+# compartilhado, então o custo fica em uma leitura de ContextVar.
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.add(self.name, time.perf_counter() - self.start)
+        return False
+
+class Timings:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages = {}
+        self.start = time.perf_counter()
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def as_ms(self) -> dict:
+        return {name: seconds * 1000 for name, seconds in self.stages.items()}
+
+    def server_timing(self, **descriptions: str) -> str:
+        parts = [f"{name};dur={ms:.3f}" for name, ms in self.as_ms().items()]
+        parts.append(f"total;dur={self.total_ms():.3f}")
+        parts += [f'{name};desc="{desc}"' for name, desc in descriptions.items()]
+        return ", ".join(parts)
+
+NULL_TIMINGS = Timings(enabled=False)
+_current = ContextVar("timings", default=NULL_TIMINGS)
+
+def stage(name: str):
+    return _current.get().stage(name)
+
+@contextmanager
+def collect(enabled: bool = True):
+    timings = Timings(enabled)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+# Submete fn(item) ao pool para cada item e espera todos; devolve
+# {item: future}. Cada tarefa mede num Timings próprio, e no Timings atual
+# entram só os estágios da tarefa mais lenta (o caminho crítico): somar
+# estágios que rodaram em paralelo passaria do tempo real decorrido.
+def submit_timed(pool, fn, items) -> dict:
+    parent = _current.get()
+    children = []
+
+    def task(item):
+        with collect(parent.enabled) as timings:
+            children.append(timings)
+            return fn(item)
+
+    futures = {item: pool.submit(task, item) for item in items}
+    wait(futures.values())
+
+    if children:
+        slowest = max(children, key=lambda t: sum(t.stages.values()))
+        for name, seconds in slowest.stages.items():
+            parent.add(name, seconds)
+    return futures
+
+# =========================
+# HISTOGRAMAS
+# =========================
+
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+class Histograms:
+    def __init__(self, buckets: tuple = BUCKETS_MS):
+        self.buckets = buckets
+        self._data = {}
+        self._lock = Lock()
+
+    def observe(self, name: str, ms: float) -> None:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                entry = self._data[name] = {"count": 0, "sum_ms": 0.0, "counts": [0] * (len(self.buckets) + 1)}
+            entry["count"] += 1
+            entry["sum_ms"] += ms
+            entry["counts"][bisect_left(self.buckets, ms)] += 1
+
+    def record(self, timings: Timings) -> None:
+        for name, ms in timings.as_ms().items():
+            self.observe(name, ms)
+        self.observe("total", timings.total_ms())
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{b}" for b in self.buckets] + ["+Inf"]
+        with self._lock:
+            return {
+                name: {
+                    "count": entry["count"],
+                    "sum_ms": round(entry["sum_ms"], 3),
+                    "buckets": dict(zip(labels, entry["counts"])),
+                }
+                for name, entry in self._data.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
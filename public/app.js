@@ -16,12 +16,10 @@ document.getElementById('github-form').addEventListener('submit', function(event
     skeleton.className = 'skeleton-loader';
     statsContainer.appendChild(skeleton);
 
-    // UX: Cache busting para garantir atualização em tempo real
-    const timestamp = new Date().getTime();
-    const dashboardUrl = `https://us-central1-github-stats-68157678-42e04.cloudfunctions.net/statsSvg?username=${username}&theme=${theme}&t=${timestamp}`;
-    
+    // Via rewrite /api/** do Hosting, para que a CDN possa guardar as respostas
+    const params = `username=${encodeURIComponent(username)}&theme=${encodeURIComponent(theme)}`;
+
     const dashboardImg = new Image();
-    dashboardImg.src = dashboardUrl;
     dashboardImg.alt = 'GitHub Dashboard';
     dashboardImg.className = 'stats-image'; // Garante o estilo CSS
 
@@ -33,4 +31,39 @@ document.getElementById('github-form').addEventListener('submit', function(event
     dashboardImg.onerror = function() {
         statsContainer.innerHTML = '<p class="error-message">Erro ao gerar as estatísticas. Verifique o nome de usuário ou tente novamente mais tarde.</p>';
     };
-});
\ No newline at end of file
+
+    // CDN: usa o dashboard pré-renderizado quando ele existe no manifesto
+    findPrerendered(username, theme).then(function(path) {
+        if (path) {
+            dashboardImg.src = `/${path}`;
+            return;
+        }
+
+        // Cache busting pela versão dos dados: a URL só muda quando os dados mudam
+        fetchDataVersion(username).then(function(version) {
+            dashboardImg.src = `/api/statsSvg?${params}&v=${version}`;
+        });
+    });
+});
+
+let manifestPromise = null;
+
+function fetchDataVersion(username) {
+    return fetch(`/api/statsSvg?username=${encodeURIComponent(username)}&format=version`)
+        .then(response => response.ok ? response.json() : null)
+        .then(data => data ? data.version : '')
+        .catch(() => '');
+}
+
+function findPrerendered(username, theme) {
+    if (!manifestPromise) {
+        manifestPromise = fetch('/dashboards/manifest.json')
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null);
+    }
+
+    return manifestPromise.then(function(manifest) {
+        const entry = manifest && manifest.dashboards && manifest.dashboards[username];
+        return entry && entry[theme] ? entry[theme].svg : null;
+    });
+}
\ No newline at end of file